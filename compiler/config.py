@@ -16,7 +16,8 @@ HIDDEN_IMPORTS = [
     "httptools",
     "websockets",
     "pydantic.v1",
-    "email_validator"
+    "email_validator",
+    "orjson"
 ]
 SOURCE_FOLDERS = [
     "middleware",
@@ -1,5 +1,8 @@
 import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
+import anyio.to_thread
 import urllib3
 import uvicorn
 from fastapi import FastAPI
@@ -13,6 +16,27 @@ from services.port import Port
 # Disable insecure request warnings from urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Configure server resources for the lifetime of the application.
+
+    Parameters
+    ----------
+    app : FastAPI
+        The FastAPI application instance.
+
+    Returns
+    -------
+    AsyncIterator[None]
+        Yields control while the application is running.
+    """
+    # Proxy endpoints are blocking and run in AnyIO's worker threads; raise
+    # the default limit of 40 so slow upstreams do not starve other clients
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = int(Env.get("THREADPOOL_SIZE", 200))
+    yield
+
 # Initialize FastAPI application with metadata and documentation.
 app = FastAPI(
     title="HTTP Proxy Server",
@@ -39,7 +63,8 @@ app = FastAPI(
         {"name": "Session", "description": "Endpoints for managing HTTP session headers and cookies."},
         {"name": "Authentication", "description": "Endpoints for user authentication and session management."},
         {"name": "Proxy", "description": "Endpoints for forwarding HTTP requests and downloading files."}
-    ]
+    ],
+    lifespan=lifespan,
 )
 
 # Add CORS middleware to allow requests from any origin.
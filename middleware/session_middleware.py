@@ -2,6 +2,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from fastapi.responses import JSONResponse
 from services.sesion_manager import SessionManager
+from services.session_context import SessionContext
 from services.log import Log
 
 class SessionMiddleware(BaseHTTPMiddleware):
@@ -45,7 +46,7 @@ class SessionMiddleware(BaseHTTPMiddleware):
 
             # Skip session validation for specified URIs
             if str(request.url.path) in self.URI_EXCEPTIONS:
-                Log.info(f"Bypassing session validation for URI: {request.url.path}")
+                Log.info("Bypassing session validation for URI: %s", request.url.path)
                 return await call_next(request)
 
             # Retrieve session ID from request headers
@@ -61,11 +62,10 @@ class SessionMiddleware(BaseHTTPMiddleware):
             # Validate session ID using SessionManager
             manager: SessionManager = SessionManager()
 
-            # Clean up expired sessions
-            manager.cleanupExpiredSessions()
-
-            # Check if session ID is valid
-            if not manager.isSessionValid(session_id):
+            # Check if session ID is valid, recording the activity and
+            # retrieving the session instance in the same lookup
+            instance = manager.touchAndGet(session_id)
+            if instance is None:
                 error_msg = "Invalid or expired session ID. Please provide a valid session ID."
                 Log.error(error_msg)
                 return JSONResponse(
@@ -73,12 +73,16 @@ class SessionMiddleware(BaseHTTPMiddleware):
                     content={"message": error_msg},
                 )
 
-            # Update last activity timestamp for the session
-            manager.updateLastActivity(session_id)
-
-            # Attach session ID to request state for downstream access
-            request.state.session_id = session_id
-            Log.info(f"Session ID '{session_id}' successfully made a request to endpoint '{request.url.path}'.")
+            # Attach the session context to request state for downstream access
+            request.state.session_context = SessionContext(
+                session_id=session_id,
+                instance=instance,
+            )
+            Log.info(
+                "Session ID '%s' successfully made a request to endpoint '%s'.",
+                session_id,
+                request.url.path,
+            )
 
             # Proceed to next middleware or route handler
             return await call_next(request)
@@ -88,7 +92,7 @@ class SessionMiddleware(BaseHTTPMiddleware):
             error_msg = (
                 "An error occurred while processing the request."
             )
-            Log.error(f"{error_msg} Error details: {str(e)}")
+            Log.error("%s Error details: %s", error_msg, e)
             return JSONResponse(
                 status_code=500,
                 content={
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+class CookiePayload(BaseModel):
+    """
+    Validate and store a cookie sent along with a proxied request.
+
+    Parameters
+    ----------
+    value : str
+        Cookie value.
+    domain : str
+        Domain the cookie applies to.
+    path : str
+        Path the cookie applies to.
+
+    Returns
+    -------
+    CookiePayload
+        An instance containing validated cookie data.
+    """
+
+    # Reject unknown keys, cookies must have exactly these fields
+    model_config = ConfigDict(extra="forbid")
+
+    value: str = Field(..., description="Cookie value")
+
+    domain: str = Field(..., description="Domain the cookie applies to")
+
+    path: str = Field(..., description="Path the cookie applies to")
@@ -1,5 +1,6 @@
 from typing import Any
 from pydantic import BaseModel, Field, field_validator
+from request.cookie_payload import CookiePayload
 
 class HTTPRequestPayload(BaseModel):
     """
@@ -22,8 +23,8 @@ class HTTPRequestPayload(BaseModel):
         JSON data for the request body.
     headers : dict[str, str] | None, default=None
         Additional HTTP headers.
-    cookies : dict[str, str] | None, default=None
-        Cookies to send with the request.
+    cookies : dict[str, CookiePayload] | None, default=None
+        Cookies to send with the request, keyed by cookie name.
     timeout : int, default=30
         Timeout in seconds (1-300).
     allow_redirects : bool, default=True
@@ -57,7 +58,7 @@ class HTTPRequestPayload(BaseModel):
         default=None, description="Additional HTTP headers"
     )
 
-    cookies: dict[str, dict] | None = Field(
+    cookies: dict[str, CookiePayload] | None = Field(
         default=None, description="Cookies to send with the request"
     )
 
@@ -125,52 +126,3 @@ class HTTPRequestPayload(BaseModel):
             error_msg = 'URL must start with http:// or https://'
             raise ValueError(error_msg)
         return v
-
-    @field_validator('cookies')
-    @classmethod
-    def validate_cookies( # NOSONAR
-        cls, v: dict[str, dict] | None
-    ) -> dict[str, dict] | None:
-        """
-        Validate cookies are in the correct format.
-
-        Parameters
-        ----------
-        cls : type[HTTPRequestPayload]
-            The class on which this method is called.
-        v : dict[str, dict] | None
-            Cookies to validate. Each cookie must be a dict with keys:
-            'value', 'domain', 'path', and all values must be strings.
-
-        Returns
-        -------
-        dict[str, dict] | None
-            The validated cookies if valid, otherwise raises ValueError.
-
-        Raises
-        ------
-        ValueError
-            If cookies are not in the correct format.
-        """
-        # Check if cookies are provided and validate their structure
-        if v is not None:
-            for key, value in v.items():
-                if not isinstance(value, dict):
-                    error_msg = (
-                        f'Cookie value for "{key}" must be a dictionary'
-                    )
-                    raise ValueError(error_msg)
-                required_keys = {'value', 'domain', 'path'}
-                if set(value.keys()) != required_keys:
-                    error_msg = (
-                        f'Cookie "{key}" must have keys: '
-                        f'{", ".join(required_keys)}'
-                    )
-                    raise ValueError(error_msg)
-                for k in required_keys:
-                    if not isinstance(value[k], str):
-                        error_msg = (
-                            f'Cookie "{key}" field "{k}" must be a string'
-                        )
-                        raise ValueError(error_msg)
-        return v
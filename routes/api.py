@@ -1,21 +1,166 @@
+from collections.abc import Iterable, Iterator
 from typing import Any
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from urllib.parse import quote, unquote
+import re
+import orjson
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from request.cookie_payload import CookiePayload
 from request.request_payload import HTTPRequestPayload
 from response.api_response import APIResponse
 from services.sesion_manager import SessionManager
+from services.session_context import SessionContext
 from services.env import Env
 import requests
+from requests.cookies import RequestsCookieJar, create_cookie
+from requests.structures import CaseInsensitiveDict
 
 # Initialize the singleton SessionManager instance
 # Session timeout is configurable via environment variable (default: 30 minutes)
+# and the number of live sessions is capped (default: 10,000)
 session_manager = SessionManager(
-    session_timeout=int(Env.get("SESSION_TIMEOUT", 60 * 30))
+    session_timeout=int(Env.get("SESSION_TIMEOUT", 60 * 30)),
+    max_sessions=int(Env.get("MAX_SESSIONS", 10_000)),
 )
 
+# Size of the chunks read from upstream when streaming file downloads
+DOWNLOAD_CHUNK_SIZE = 128 * 1024
+
+# Minimum amount of data sent to the client per streamed download message
+DOWNLOAD_SEND_SIZE = 256 * 1024
+
+# Matches the RFC 5987 (filename*=charset'lang'value) and the plain forms of
+# the filename parameter in a Content-Disposition header
+_FILENAME_RE = re.compile(
+    r"filename\*=\"?(?P<charset>[\w.-]+)'[\w.-]*'(?P<encoded>[^\";]+)\"?"
+    r"|filename=\"?(?P<plain>[^\";]+)\"?",
+    re.IGNORECASE,
+)
+
+# Characters that must not reach the outgoing Content-Disposition header:
+# control characters, quoting characters and path separators
+_UNSAFE_FILENAME_RE = re.compile(r'[\x00-\x1f\x7f-\x9f"\\/]')
+
 # Define API router with grouped tags and descriptions
 proxy_router = APIRouter()
 
+def _merge_cookies(
+    jar: RequestsCookieJar, cookies: dict[str, CookiePayload] | None
+) -> None:
+    """
+    Store the cookies sent in a request payload in a session cookie jar.
+
+    Parameters
+    ----------
+    jar : RequestsCookieJar
+        Session cookie jar to update.
+    cookies : dict[str, CookiePayload] | None
+        Validated payload cookies keyed by name.
+
+    Returns
+    -------
+    None
+        This method does not return a value.
+    """
+    # The payload is already validated, so build the cookies directly
+    # instead of going through the generic jar.set() dispatch
+    for name, cookie in (cookies or {}).items():
+        jar.set_cookie(
+            create_cookie(
+                name, cookie.value, domain=cookie.domain, path=cookie.path
+            )
+        )
+
+def _coalesce_chunks(
+    chunks: Iterable[bytes], size: int = DOWNLOAD_SEND_SIZE
+) -> Iterator[bytes]:
+    """
+    Group consecutive chunks into blocks of at least the given size.
+
+    Parameters
+    ----------
+    chunks : Iterable[bytes]
+        Chunks read from the upstream response.
+    size : int, optional
+        Minimum number of bytes yielded per block, except for the last one.
+
+    Returns
+    -------
+    Iterator[bytes]
+        Blocks of coalesced data.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+def _download_filename(content_disp: str | None) -> str:
+    """
+    Extract a safe file name from an upstream Content-Disposition header.
+
+    As required by RFC 6266, the filename* parameter takes precedence over
+    the plain filename parameter when both are present. Its value is decoded
+    with the charset it declares, falling back to UTF-8 for unknown ones.
+
+    Parameters
+    ----------
+    content_disp : str or None
+        Content-Disposition header sent by the upstream server.
+
+    Returns
+    -------
+    str
+        The sanitized file name, or "downloaded_file" if none is usable.
+    """
+    filename = None
+    for match in _FILENAME_RE.finditer(content_disp or ""):
+        if match.group("encoded"):
+            try:
+                filename = unquote(
+                    match.group("encoded"),
+                    encoding=match.group("charset"),
+                    errors="replace",
+                )
+            except LookupError:
+                filename = unquote(match.group("encoded"), errors="replace")
+            break
+        if filename is None:
+            filename = match.group("plain").strip()
+
+    # The decoded name is copied into a response header, so strip anything
+    # that could break or inject into it
+    filename = _UNSAFE_FILENAME_RE.sub("", filename or "").strip(" .")
+    return filename or "downloaded_file"
+
+def _serialize_cookies(jar: RequestsCookieJar) -> list[dict[str, Any]]:
+    """
+    Convert a cookie jar into a JSON-serializable list of cookies.
+
+    Parameters
+    ----------
+    jar : RequestsCookieJar
+        Cookie jar to serialize.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        One dictionary per cookie with its name, value, domain and path.
+    """
+    return [
+        {
+            "name": c.name,
+            "value": c.value,
+            "domain": c.domain,
+            "path": c.path,
+        }
+        for c in jar
+    ]
+
 @proxy_router.get(
     "/health-check",
     summary="Service Health Check",
@@ -131,17 +276,18 @@ def health(request: Request) -> JSONResponse:
     tags=["Session"],
 )
 def set_headers(
-    request: Request, payload: dict[str, str]
+    payload: dict[str, str],
+    context: SessionContext = Depends(SessionContext.fromRequest),
 ) -> JSONResponse:
     """
     Set custom headers for the global HTTP session.
 
     Parameters
     ----------
-    request : Request
-        The incoming FastAPI request object.
     payload : dict[str, str]
         Dictionary of header key-value pairs to set.
+    context : SessionContext
+        The session bound to the current request.
 
     Returns
     -------
@@ -158,14 +304,10 @@ def set_headers(
             content={"detail": error_msg},
         )
 
-    # Retrieve the session instance from the request state
-    session = session_manager.getSessionInstance(
-        request.state.session_id
-    )
-
-    # Reset and update session headers if session is available in request state
-    session.headers.clear()
-    session.headers.update(payload)
+    # Swap in a fresh header mapping instead of mutating the shared one in
+    # place, so concurrent requests on this session never observe a
+    # half-cleared set of headers
+    context.instance.headers = CaseInsensitiveDict(payload)
 
     return JSONResponse(
         status_code=200,
@@ -189,14 +331,16 @@ def set_headers(
     response_model=dict[str, str],
     tags=["Session"],
 )
-def get_headers(request: Request) -> JSONResponse:
+def get_headers(
+    context: SessionContext = Depends(SessionContext.fromRequest),
+) -> JSONResponse:
     """
     Retrieve the current headers set in the global HTTP session.
 
     Parameters
     ----------
-    request : Request
-        The incoming FastAPI request object.
+    context : SessionContext
+        The session bound to the current request.
 
     Returns
     -------
@@ -204,7 +348,7 @@ def get_headers(request: Request) -> JSONResponse:
         JSON response containing the current session headers.
     """
     # Get the session instance for the current request
-    session = session_manager.getSessionInstance(request.state.session_id)
+    session = context.instance
 
     # Return the current session headers
     return JSONResponse(
@@ -228,14 +372,16 @@ def get_headers(request: Request) -> JSONResponse:
     response_model=dict[str, dict],
     tags=["Session"],
 )
-def get_cookies(request: Request) -> JSONResponse:
+def get_cookies(
+    context: SessionContext = Depends(SessionContext.fromRequest),
+) -> JSONResponse:
     """
     Retrieve the current cookies stored in the global HTTP session.
 
     Parameters
     ----------
-    request : Request
-        The incoming FastAPI request object.
+    context : SessionContext
+        The session bound to the current request.
 
     Returns
     -------
@@ -243,22 +389,14 @@ def get_cookies(request: Request) -> JSONResponse:
         JSON response containing the current session cookies.
     """
     # Get the session instance for the current request
-    session = session_manager.getSessionInstance(request.state.session_id)
+    session = context.instance
 
     # Return the current session cookies as a list of dictionaries
     return JSONResponse(
         status_code=200,
         content={
             "status": "OK",
-            "cookies": [
-                {
-                    "name": c.name,
-                    "value": c.value,
-                    "domain": c.domain,
-                    "path": c.path,
-                }
-                for c in session.cookies
-            ],
+            "cookies": _serialize_cookies(session.cookies),
         },
     )
 
@@ -275,14 +413,16 @@ def get_cookies(request: Request) -> JSONResponse:
     response_model=dict[str, Any],
     tags=["Session"],
 )
-def get_session_info(request: Request) -> JSONResponse:
+def get_session_info(
+    context: SessionContext = Depends(SessionContext.fromRequest),
+) -> JSONResponse:
     """
     Retrieve detailed information about the current HTTP session.
 
     Parameters
     ----------
-    request : Request
-        The incoming FastAPI request object.
+    context : SessionContext
+        The session bound to the current request.
 
     Returns
     -------
@@ -291,19 +431,11 @@ def get_session_info(request: Request) -> JSONResponse:
         status.
     """
     # Get the session instance for the current request
-    session = session_manager.getSessionInstance(request.state.session_id)
+    session = context.instance
 
     # Build session information dictionary
     session_info = {
-        "cookies": [
-            {
-                "name": c.name,
-                "value": c.value,
-                "domain": c.domain,
-                "path": c.path,
-            }
-            for c in session.cookies
-        ],
+        "cookies": _serialize_cookies(session.cookies),
         "headers": dict(session.headers),
         "verify_ssl": session.verify,
     }
@@ -378,23 +510,24 @@ def subscribe(request: Request) -> JSONResponse:
     response_model=dict[str, str],
     tags=["Authentication"]
 )
-def unsubscribe(request: Request) -> JSONResponse:
+def unsubscribe(
+    context: SessionContext = Depends(SessionContext.fromRequest),
+) -> JSONResponse:
     """
     Unsubscribe from the proxy and remove the current session.
 
     Parameters
     ----------
-    request : Request
-        The incoming FastAPI request object.
+    context : SessionContext
+        The session bound to the current request.
 
     Returns
     -------
     JSONResponse
         JSON response indicating the result of the unsubscribe operation.
     """
-    # If session ID is available in request state, delete the session
-    if hasattr(request.state, "session_id"):
-        session_manager.deleteSession(request.state.session_id)
+    # Delete the session bound to the current request
+    session_manager.deleteSession(context.session_id)
 
     # Return success response
     return JSONResponse(
@@ -430,96 +563,82 @@ def unsubscribe(request: Request) -> JSONResponse:
                    2. Merges session cookies with additional cookies
                    3. Executes the request using the authenticated session
                    4. Returns a complete response with metadata
+
+                   Pass `verbose=true` to also include every cookie stored in
+                   the session under `session_cookies`.
                 """,
     response_model=APIResponse,
     tags=["Proxy"]
 )
 def forward(
-    request: Request,
     payload: HTTPRequestPayload,
-) -> JSONResponse:
+    verbose: bool = Query(
+        default=False,
+        description="Include all session cookies in the response",
+    ),
+    context: SessionContext = Depends(SessionContext.fromRequest),
+) -> Response:
     """
     Forward an HTTP request while maintaining session and cookies.
 
     Parameters
     ----------
-    request : Request
-        The incoming FastAPI request object.
     payload : HTTPRequestPayload
         The payload containing HTTP request details.
+    verbose : bool, default=False
+        Whether to include all session cookies in the response.
+    context : SessionContext
+        The session bound to the current request.
 
     Returns
     -------
-    JSONResponse
+    Response
         A JSON response containing the proxied HTTP response data and metadata.
     """
     try:
         # Retrieve the session instance for the current request
-        session = session_manager.getSessionInstance(
-            request.state.session_id
-        )
-
-        # Merge session headers with custom headers from payload
-        request_headers = session.headers.copy()
-        if payload.headers:
-            request_headers.update(payload.headers)
+        session = context.instance
 
         # Merge session cookies with additional cookies from payload
-        if payload.cookies and isinstance(payload.cookies, dict):
-            for name, data in payload.cookies.items():
-                session.cookies.set(
-                    name,
-                    data["value"],
-                    domain=data.get("domain"),
-                    path=data.get("path"),
-                )
+        _merge_cookies(session.cookies, payload.cookies)
 
-        # Execute HTTP request using the configured session
+        # Execute HTTP request using the configured session; requests merges
+        # the session headers with the payload headers on its own
         response = session.request(
             method=payload.method,
             url=payload.url,
             params=payload.params,
             data=payload.data,
             json=payload.json_data,
-            headers=request_headers,
+            headers=payload.headers,
             timeout=payload.timeout,
             allow_redirects=payload.allow_redirects,
         )
 
-        # Update session cookies with any new cookies received in the response
-        if response.cookies:
-            session.cookies.update(response.cookies)
+        # Read the body once and decode it straight from the raw bytes. Fall
+        # back to UTF-8 when the upstream declares no usable charset, so that
+        # decoding never triggers charset detection on the content
+        content = response.content
+        encoding = response.encoding or "utf-8"
+        try:
+            body = content.decode(encoding, errors="replace")
+        except LookupError:
+            encoding = "utf-8"
+            body = content.decode(encoding, errors="replace")
 
         # Build detailed response data for the client
         response_data = {
             "status": response.reason or "OK",
             "status_code": response.status_code,
             "headers": dict(response.headers),
-            "cookies": [
-                {
-                    "name": c.name,
-                    "value": c.value,
-                    "domain": c.domain,
-                    "path": c.path,
-                }
-                for c in response.cookies
-            ],
-            "session_cookies": [
-                {
-                    "name": c.name,
-                    "value": c.value,
-                    "domain": c.domain,
-                    "path": c.path,
-                }
-                for c in session.cookies
-            ],
+            "cookies": _serialize_cookies(response.cookies),
             "url": str(response.url),
             "elapsed": round(response.elapsed.total_seconds(), 3),
-            "encoding": response.encoding,
+            "encoding": encoding,
             "ok": response.ok,
             "history": [str(r.url) for r in response.history],
             "content_type": response.headers.get("content-type", "unknown"),
-            "body": response.text,
+            "body": body,
             "request_info": {
                 "method": payload.method,
                 "original_url": payload.url,
@@ -528,14 +647,22 @@ def forward(
                 "request_size_bytes": len(
                     str(payload.data or payload.json_data or "")
                 ),
-                "response_size_bytes": len(response.content),
+                "response_size_bytes": len(content),
             },
         }
 
-        # Return the detailed response data to the client
-        return JSONResponse(
+        # Walking the whole session cookie jar is only done on request
+        if verbose:
+            response_data["session_cookies"] = _serialize_cookies(
+                session.cookies
+            )
+
+        # Return the detailed response data to the client, serialized with
+        # orjson since the envelope carries the full upstream body
+        return Response(
+            content=orjson.dumps(response_data),
             status_code=response.status_code,
-            content=response_data,
+            media_type="application/json",
         )
 
     except requests.exceptions.Timeout:
@@ -598,18 +725,18 @@ def forward(
     response_model=None
 )
 def download(
-    request: Request,
     payload: HTTPRequestPayload,
+    context: SessionContext = Depends(SessionContext.fromRequest),
 ):
     """
     Download a file using the authenticated session and return it as a direct download.
 
     Parameters
     ----------
-    request : Request
-        The incoming FastAPI request object.
     payload : HTTPRequestPayload
         The payload containing HTTP request details.
+    context : SessionContext
+        The session bound to the current request.
 
     Returns
     -------
@@ -619,61 +746,66 @@ def download(
     """
     try:
         # Retrieve the session instance for the current request
-        session = session_manager.getSessionInstance(
-            request.state.session_id
-        )
-
-        # Merge session headers with custom headers from payload
-        request_headers = session.headers.copy()
-        if payload.headers:
-            request_headers.update(payload.headers)
+        session = context.instance
 
         # Merge session cookies with additional cookies from payload
-        if payload.cookies and isinstance(payload.cookies, dict):
-            for name, data in payload.cookies.items():
-                session.cookies.set(
-                    name,
-                    data["value"],
-                    domain=data.get("domain"),
-                    path=data.get("path"),
-                )
+        _merge_cookies(session.cookies, payload.cookies)
 
-        # Execute HTTP request using the configured session, streaming response
+        # Execute HTTP request using the configured session, streaming the
+        # response; requests merges session and payload headers on its own
         response = session.request(
             method=payload.method,
             url=payload.url,
             params=payload.params,
             data=payload.data,
             json=payload.json_data,
-            headers=request_headers,
+            headers=payload.headers,
             timeout=payload.timeout,
             allow_redirects=payload.allow_redirects,
             stream=True,
         )
 
-        # Update session cookies with any new cookies received in the response
-        if response.cookies:
-            session.cookies.update(response.cookies)
-
         # Get content type and suggested filename from response headers
         content_type = response.headers.get(
             "content-type", "application/octet-stream"
         )
-        content_disp = response.headers.get("content-disposition")
-        filename = "downloaded_file"
-        if content_disp:
-            import re
-            match = re.search(r'filename="?([^";]+)"?', content_disp)
-            if match:
-                filename = match.group(1)
-
-        # Return file as a direct download using StreamingResponse
+        filename = _download_filename(
+            response.headers.get("content-disposition")
+        )
+
+        # Non-ASCII names travel in filename*, with an ASCII fallback
+        ascii_filename = filename.encode("ascii", "replace").decode("ascii")
+        download_headers = {
+            "Content-Disposition": (
+                f'attachment; filename="{ascii_filename}"; '
+                f"filename*=UTF-8''{quote(filename)}"
+            )
+        }
+
+        # Forward the upstream length only when the body is relayed as-is;
+        # iter_content decodes gzip/deflate, which changes the byte count, and
+        # HEAD, 204 and 304 responses declare a length but carry no body
+        content_length = response.headers.get("content-length")
+        has_body = (
+            payload.method != "HEAD"
+            and response.status_code not in (204, 304)
+        )
+        if (
+            content_length
+            and has_body
+            and not response.headers.get("content-encoding")
+        ):
+            download_headers["Content-Length"] = content_length
+
+        # Return file as a direct download using StreamingResponse, releasing
+        # the upstream connection back to the pool once the body is sent
         return StreamingResponse(
-            response.iter_content(chunk_size=8192),
+            _coalesce_chunks(
+                response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            ),
             media_type=content_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"'
-            },
+            headers=download_headers,
+            background=BackgroundTask(response.close),
         )
 
     except requests.exceptions.Timeout:
@@ -0,0 +1,133 @@
+import socket
+import time
+from typing import Any, Callable
+from urllib3.util import connection
+
+class DnsCache:
+    """
+    Cache upstream host name resolutions for a limited time.
+
+    Once installed, every new urllib3 connection resolves its host through
+    this cache, so repeated requests to the same upstream skip the resolver
+    round-trip until the entry expires.
+
+    Attributes
+    ----------
+    MAX_ENTRIES : int
+        Maximum number of cached resolutions before the cache is reset.
+    """
+
+    MAX_ENTRIES = 1024
+
+    _ttl: float = 60.0
+    _entries: dict[tuple[str, int, int], tuple[float, list[tuple]]] = {}
+    _create_connection: Callable[..., socket.socket] | None = None
+
+    @classmethod
+    def install(cls, ttl: float) -> None:
+        """
+        Route urllib3 connection creation through the cache.
+
+        Parameters
+        ----------
+        ttl : float
+            Seconds a resolution is reused. Values of 0 or less disable the
+            cache.
+
+        Returns
+        -------
+        None
+            This method does not return a value.
+        """
+        # Install only once, and only when caching is enabled
+        if cls._create_connection is not None or ttl <= 0:
+            return
+
+        cls._ttl = ttl
+        cls._create_connection = connection.create_connection
+        connection.create_connection = cls.createConnection
+
+    @classmethod
+    def resolve(cls, host: str, port: int, family: int) -> list[tuple]:
+        """
+        Resolve a host, reusing a cached result while it is fresh.
+
+        Parameters
+        ----------
+        host : str
+            Host name to resolve.
+        port : int
+            Port to resolve for.
+        family : int
+            Address family passed to getaddrinfo.
+
+        Returns
+        -------
+        list[tuple]
+            Address information as returned by socket.getaddrinfo.
+        """
+        key = (host, port, family)
+        now = time.monotonic()
+
+        # Serve the cached addresses while they have not expired
+        entry = cls._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        addresses = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+
+        # Keep memory bounded when many distinct hosts are proxied
+        if len(cls._entries) >= cls.MAX_ENTRIES:
+            cls._entries.clear()
+        cls._entries[key] = (now + cls._ttl, addresses)
+        return addresses
+
+    @classmethod
+    def createConnection(
+        cls, address: tuple[str, int], *args: Any, **kwargs: Any
+    ) -> socket.socket:
+        """
+        Open a connection to the first reachable cached address.
+
+        Replacement for urllib3.util.connection.create_connection. Socket
+        setup is delegated to the original function with a numeric address,
+        which resolves locally without querying DNS.
+
+        Parameters
+        ----------
+        address : tuple[str, int]
+            Host and port to connect to.
+        *args : Any
+            Positional arguments forwarded to urllib3.
+        **kwargs : Any
+            Keyword arguments forwarded to urllib3.
+
+        Returns
+        -------
+        socket.socket
+            The connected socket.
+
+        Raises
+        ------
+        OSError
+            If no resolved address accepts the connection.
+        """
+        assert cls._create_connection is not None
+        host, port = address
+        if host.startswith("["):
+            host = host.strip("[]")
+
+        # Try each resolved address in order, like urllib3 does
+        error: OSError | None = None
+        family = connection.allowed_gai_family()
+        for _, _, _, _, sockaddr in cls.resolve(host, port, family):
+            try:
+                return cls._create_connection(
+                    (sockaddr[0], port), *args, **kwargs
+                )
+            except OSError as e:
+                error = e
+
+        if error is not None:
+            raise error
+        raise OSError("getaddrinfo returned an empty list")
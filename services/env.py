@@ -13,6 +13,7 @@ class Env:
     """
 
     _loaded: Final[bool] = False
+    _cache: dict[str, str | None] = {}
 
     @classmethod
     def _load_env(cls, dotenv_filename: str = ".env") -> None:
@@ -65,6 +66,23 @@ class Env:
         str | None
             Value of the environment variable, or default if not set.
         """
-        # Ensure environment variables are loaded before access
-        cls._load_env()
-        return os.environ.get(name, default)
+        # Resolve each variable once; the raw value is cached so that
+        # different defaults for the same name keep working
+        if name not in cls._cache:
+            cls._load_env()
+            cls._cache[name] = os.environ.get(name)
+
+        value = cls._cache[name]
+        return default if value is None else value
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """
+        Clear cached values so the next lookups read the environment again.
+
+        Returns
+        -------
+        None
+            This method does not return a value.
+        """
+        cls._cache.clear()
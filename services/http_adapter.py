@@ -0,0 +1,60 @@
+import socket
+from typing import Any
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    Transport adapter that tunes upstream sockets for proxy traffic.
+
+    Disables Nagle's algorithm so small request bodies are sent immediately
+    and enables TCP keepalive so idle pooled connections are not silently
+    dropped by NAT devices or firewalls between requests.
+
+    Attributes
+    ----------
+    KEEPALIVE_IDLE : int
+        Seconds a connection stays idle before keepalive probes are sent.
+    """
+
+    KEEPALIVE_IDLE = 60
+
+    @classmethod
+    def socketOptions(cls) -> list[tuple[int, int, int]]:
+        """
+        Build the socket options applied to every upstream connection.
+
+        Returns
+        -------
+        list[tuple[int, int, int]]
+            Socket options as (level, option, value) tuples.
+        """
+        # Start from urllib3 defaults, which already include TCP_NODELAY
+        options = list(HTTPConnection.default_socket_options)
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+        # TCP_KEEPIDLE is not exposed on every platform
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            options.append(
+                (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, cls.KEEPALIVE_IDLE)
+            )
+        return options
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Initialize the urllib3 pool manager with the tuned socket options.
+
+        Parameters
+        ----------
+        *args : Any
+            Positional arguments forwarded to HTTPAdapter.
+        **kwargs : Any
+            Keyword arguments forwarded to HTTPAdapter.
+
+        Returns
+        -------
+        None
+            This method does not return a value.
+        """
+        kwargs.setdefault("socket_options", self.socketOptions())
+        super().init_poolmanager(*args, **kwargs)
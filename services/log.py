@@ -1,9 +1,12 @@
+import atexit
 import logging
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from datetime import datetime
 from pathlib import Path
+import queue
 import sys
 import os
+from services.env import Env
 
 class Log:
     """
@@ -14,6 +17,7 @@ class Log:
 
     _initialized = False
     _logger: logging.Logger | None = None
+    _listener: QueueListener | None = None
 
     @classmethod
     def _init(cls) -> None:
@@ -21,7 +25,9 @@ class Log:
         Initialize the logger if it has not been initialized.
 
         Set up a timed rotating file handler and formatting for logging.
-        Prevent duplicate handlers and ensure logs are stored in a dedicated
+        Records are handed to the file handler through a queue drained by a
+        background listener, so callers never block on disk I/O. Prevent
+        duplicate handlers and ensure logs are stored in a dedicated
         directory.
 
         Parameters
@@ -58,8 +64,15 @@ class Log:
         except Exception:
             return
 
+        # Honor the configured LOG_LEVEL, falling back to INFO for unknown
+        # names such as uvicorn's "trace"
+        level_name = (Env.get("LOG_LEVEL", "info") or "info").upper()
+        level = logging.getLevelName(level_name)
+        if not isinstance(level, int):
+            level = logging.INFO
+
         logger = logging.getLogger("HTTPProxyLogger")
-        logger.setLevel(logging.INFO)
+        logger.setLevel(level)
         logger.propagate = False
 
         # Configure timed rotating file handler for daily log rotation
@@ -77,26 +90,35 @@ class Log:
         )
         handler.setFormatter(formatter)
 
-        # Avoid adding duplicate handlers for the same log file
-        if not any(
-            isinstance(h, TimedRotatingFileHandler)
-            and h.baseFilename == handler.baseFilename
-            for h in logger.handlers
-        ):
-            logger.addHandler(handler)
+        # Avoid adding duplicate handlers for the same logger
+        if not any(isinstance(h, QueueHandler) for h in logger.handlers):
+
+            # Write to the file from a background thread fed by a queue
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            logger.addHandler(QueueHandler(log_queue))
+            listener = QueueListener(
+                log_queue, handler, respect_handler_level=True
+            )
+            listener.start()
+
+            # Flush pending records when the process exits
+            atexit.register(listener.stop)
+            cls._listener = listener
 
         cls._logger = logger
         cls._initialized = True
 
     @classmethod
-    def info(cls, message: str) -> None:
+    def info(cls, message: str, *args: object) -> None:
         """
         Log an informational message.
 
         Parameters
         ----------
         message : str
-            The message to log.
+            The message to log, optionally with %-style placeholders.
+        *args : object
+            Arguments merged into the message only if it is emitted.
 
         Returns
         -------
@@ -105,17 +127,19 @@ class Log:
         """
         cls._init()
         assert cls._logger is not None
-        cls._logger.info(message)
+        cls._logger.info(message, *args)
 
     @classmethod
-    def warning(cls, message: str) -> None:
+    def warning(cls, message: str, *args: object) -> None:
         """
         Log a warning message.
 
         Parameters
         ----------
         message : str
-            The message to log.
+            The message to log, optionally with %-style placeholders.
+        *args : object
+            Arguments merged into the message only if it is emitted.
 
         Returns
         -------
@@ -124,17 +148,19 @@ class Log:
         """
         cls._init()
         assert cls._logger is not None
-        cls._logger.warning(message)
+        cls._logger.warning(message, *args)
 
     @classmethod
-    def error(cls, message: str) -> None:
+    def error(cls, message: str, *args: object) -> None:
         """
         Log an error message.
 
         Parameters
         ----------
         message : str
-            The message to log.
+            The message to log, optionally with %-style placeholders.
+        *args : object
+            Arguments merged into the message only if it is emitted.
 
         Returns
         -------
@@ -143,4 +169,4 @@ class Log:
         """
         cls._init()
         assert cls._logger is not None
-        cls._logger.error(message)
+        cls._logger.error(message, *args)
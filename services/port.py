@@ -1,3 +1,5 @@
+import socket
+
 class Port:
 
     @staticmethod
@@ -5,6 +7,10 @@ class Port:
         """
         Check if a TCP port is available for binding on the specified host.
 
+        Every address the host resolves to (IPv4 and IPv6) is checked, and the
+        socket is configured the way the server's listener will be, so that
+        connections lingering in TIME_WAIT are not reported as a busy port.
+
         Parameters
         ----------
         host : str
@@ -17,12 +23,21 @@ class Port:
         bool
             True if the port is available for binding, False otherwise.
         """
-        import socket
+        for family, socktype, proto, _, address in socket.getaddrinfo(
+            host, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE
+        ):
+            with socket.socket(family, socktype, proto) as s:
+
+                # On Windows SO_REUSEADDR would allow binding over an active
+                # listener, so request exclusive use of the address instead
+                if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):
+                    s.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+                else:
+                    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 
-        # Attempt to bind to the specified host and port to check availability.
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            try:
-                s.bind((host, port))
-                return True
-            except OSError:
-                return False
\ No newline at end of file
+                # Attempt to bind to the resolved address to check availability.
+                try:
+                    s.bind(address)
+                except OSError:
+                    return False
+        return True
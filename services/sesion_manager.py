@@ -1,49 +1,376 @@
-from datetime import datetime, timedelta
-from typing import Any, Dict
-import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+import threading
+import time
+import secrets
 import requests
+from urllib3.util.retry import Retry
+from services.dns_cache import DnsCache
+from services.env import Env
+from services.http_adapter import KeepAliveAdapter
+from services.log import Log
+from services.session_record import SessionRecord
+
+class _StripedSessionMap:
+    """
+    Store sessions in independently locked stripes.
+
+    Each stripe is an OrderedDict kept in order of last activity and guarded
+    by its own lock, so writers only contend with writers of the same stripe.
+    Reads are single dictionary lookups and take no lock. The total number of
+    sessions is tracked separately, so the capacity applies to the whole store
+    rather than to each stripe.
+    """
+
+    def __init__(self, capacity: int, stripes: int = 32) -> None:
+        """
+        Initialize the empty stripes.
 
-class SessionManager:
+        Parameters
+        ----------
+        capacity : int
+            Maximum number of sessions kept across all stripes.
+        stripes : int, optional
+            Number of stripes, must be a power of two.
+
+        Returns
+        -------
+        None
+            This method does not return a value.
+        """
+        self._mask = stripes - 1
+        self._capacity = max(1, capacity)
+        self._size = 0
+        self._size_lock = threading.Lock()
+        self._stripes: list[tuple[OrderedDict, threading.RLock]] = [
+            (OrderedDict(), threading.RLock()) for _ in range(stripes)
+        ]
+
+    def _stripe(
+        self,
+        session_id: str
+    ) -> tuple[OrderedDict, threading.RLock]:
+        """
+        Retrieve the stripe and lock that hold a session ID.
 
-    _instance = None
-    _sessions: Dict[str, Dict[str, Any]] = {}
-    _session_timeout: int = 600
+        Parameters
+        ----------
+        session_id : str
+            Session ID.
 
-    def __new__(cls, session_timeout: int = 600) -> "SessionManager":
+        Returns
+        -------
+        tuple[OrderedDict, threading.RLock]
+            The stripe's sessions and the lock guarding them.
         """
-        Create or return the singleton instance of SessionManager.
+        return self._stripes[hash(session_id) & self._mask]
+
+    def __len__(self) -> int:
+        """
+        Count the sessions stored across all stripes.
+
+        Returns
+        -------
+        int
+            Number of stored sessions.
+        """
+        return self._size
+
+    def __contains__(self, session_id: str) -> bool:
+        """
+        Check if a session is stored.
 
         Parameters
         ----------
-        session_timeout : int, optional
-            Timeout in seconds for session expiration.
+        session_id : str
+            Session ID.
 
         Returns
         -------
-        SessionManager
-            Singleton instance of SessionManager.
+        bool
+            True if the session is stored, otherwise False.
         """
-        if cls._instance is None:
-            cls._instance = super(SessionManager, cls).__new__(cls)
-            cls._session_timeout = session_timeout
-        return cls._instance
+        return session_id in self._stripe(session_id)[0]
 
-    def __init__(self, session_timeout: int = 600) -> None:
+    def get(self, session_id: str) -> SessionRecord | None:
         """
-        Initialize the SessionManager instance.
+        Retrieve a stored session.
 
         Parameters
         ----------
-        session_timeout : int, optional
-            Timeout in seconds for session expiration.
+        session_id : str
+            Session ID.
+
+        Returns
+        -------
+        SessionRecord or None
+            Session data if stored, otherwise None.
+        """
+        return self._stripe(session_id)[0].get(session_id)
+
+    def add(
+        self,
+        session_id: str,
+        session_data: SessionRecord
+    ) -> bool:
+        """
+        Store a new session, evicting a least recently used one once the
+        store is full.
+
+        An existing session with the same ID is never overwritten.
+
+        Parameters
+        ----------
+        session_id : str
+            Session ID.
+        session_data : SessionRecord
+            Session data to store.
+
+        Returns
+        -------
+        bool
+            True if the session was stored, False if the ID is already taken.
+        """
+        sessions, lock = self._stripe(session_id)
+        with lock:
+            if sessions.setdefault(session_id, session_data) is not session_data:
+                return False
+
+        with self._size_lock:
+            self._size += 1
+            full = self._size > self._capacity
+
+        # Evict outside the stripe lock, the victim may live in another stripe
+        if full:
+            self._evictOne(keep=session_id)
+        return True
+
+    def _evictOne(self, keep: str) -> None:
+        """
+        Remove the least recently used session of the whole store.
+
+        Every stripe is kept in order of last activity, so the least recently
+        used session is the head with the oldest activity among the stripes.
+
+        Parameters
+        ----------
+        keep : str
+            Session ID that must not be evicted, the one just stored.
+
+        Returns
+        -------
+        None
+            This method does not return a value.
+        """
+        while True:
+            # Peek at the head of each stripe, one stripe lock at a time
+            victim = None
+            for stripe in self._stripes:
+                sessions, lock = stripe
+                with lock:
+                    head = next(
+                        (item for item in sessions.items() if item[0] != keep),
+                        None,
+                    )
+                if head is None:
+                    continue
+                session_id, session_data = head
+                if victim is None or session_data.last_activity < victim[0]:
+                    victim = (session_data.last_activity, session_id, stripe)
+
+            if victim is None:
+                return
+
+            last_activity, session_id, (sessions, lock) = victim
+            with lock:
+                session_data = sessions.get(session_id)
+                if session_data is None:
+                    # Removed concurrently, the store already shrank
+                    return
+                if session_data.last_activity != last_activity:
+                    # Used concurrently, look for the new oldest session
+                    continue
+                del sessions[session_id]
+            with self._size_lock:
+                self._size -= 1
+            return
+
+    def pop(self, session_id: str) -> SessionRecord | None:
+        """
+        Remove a stored session.
+
+        Parameters
+        ----------
+        session_id : str
+            Session ID.
+
+        Returns
+        -------
+        SessionRecord or None
+            The removed session data, or None if it was not stored.
+        """
+        sessions, lock = self._stripe(session_id)
+        with lock:
+            session_data = sessions.pop(session_id, None)
+        if session_data is not None:
+            with self._size_lock:
+                self._size -= 1
+        return session_data
+
+    def touch(self, session_id: str) -> None:
+        """
+        Mark a session as the most recently used one of its stripe.
+
+        Parameters
+        ----------
+        session_id : str
+            Session ID.
 
         Returns
         -------
         None
             This method does not return a value.
         """
-        # Only initializes the timeout the first time
-        pass
+        sessions, lock = self._stripe(session_id)
+        with lock:
+            try:
+                sessions.move_to_end(session_id)
+            except KeyError:
+                # The session was removed concurrently
+                pass
+
+    def popExpired(
+        self,
+        is_expired: Callable[[SessionRecord], bool]
+    ) -> int:
+        """
+        Remove the expired sessions at the front of every stripe.
+
+        Sessions are removed as they are found, in a single pass that holds
+        only one stripe lock at a time.
+
+        Parameters
+        ----------
+        is_expired : Callable[[SessionRecord], bool]
+            Predicate telling whether a session has expired.
+
+        Returns
+        -------
+        int
+            Number of removed sessions.
+        """
+        removed = 0
+        for sessions, lock in self._stripes:
+            with lock:
+                while sessions:
+                    session_id, session_data = next(iter(sessions.items()))
+                    if not is_expired(session_data):
+                        break
+                    del sessions[session_id]
+                    removed += 1
+        with self._size_lock:
+            self._size -= removed
+        return removed
+
+    def values(self) -> list[SessionRecord]:
+        """
+        Take a snapshot of all stored sessions.
+
+        Returns
+        -------
+        list[SessionRecord]
+            Data of every stored session.
+        """
+        snapshot = []
+        for sessions, lock in self._stripes:
+            with lock:
+                snapshot.extend(sessions.values())
+        return snapshot
+
+class SessionManager:
+
+    _instance: "SessionManager | None" = None
+    _init_lock = threading.Lock()
+    _sessions: _StripedSessionMap
+    _session_timeout: int
+    _session_timeout_ns: int
+    _max_sessions: int
+    _adapter: KeepAliveAdapter
+
+    def __new__(
+        cls,
+        session_timeout: int = 600,
+        max_sessions: int = 10_000
+    ) -> "SessionManager":
+        """
+        Create or return the singleton instance of SessionManager.
+
+        Creation is guarded by a lock, so concurrent first calls cannot
+        build two managers with separate session stores, and the instance
+        is only published once it is fully initialized.
+
+        Parameters
+        ----------
+        session_timeout : int, optional
+            Timeout in seconds for session expiration.
+        max_sessions : int, optional
+            Maximum number of sessions kept before evicting the least
+            recently used one.
+
+        Returns
+        -------
+        SessionManager
+            Singleton instance of SessionManager.
+        """
+        if cls._instance is None:
+            with cls._init_lock:
+                if cls._instance is None:
+                    instance = super(SessionManager, cls).__new__(cls)
+                    instance._session_timeout = session_timeout
+                    instance._session_timeout_ns = session_timeout * 1_000_000_000
+                    instance._max_sessions = max_sessions
+                    instance._sessions = _StripedSessionMap(capacity=max_sessions)
+
+                    # Share one transport across all sessions, so upstream
+                    # connections are pooled per host rather than per client.
+                    # Use keepalive-tuned sockets and a pool large enough for
+                    # concurrent proxied requests, retrying briefly on
+                    # transient gateway errors. Upstream Retry-After headers
+                    # are ignored and the backoff is capped, so an upstream
+                    # cannot hold a worker thread past the request timeout
+                    instance._adapter = KeepAliveAdapter(
+                        pool_connections=100,
+                        pool_maxsize=500,
+                        max_retries=Retry(
+                            total=2,
+                            backoff_factor=0.1,
+                            backoff_max=0.5,
+                            status_forcelist=[502, 503, 504],
+                            respect_retry_after_header=False,
+                            raise_on_status=False,
+                        ),
+                    )
+
+                    # Cache upstream DNS lookups for the connections sessions
+                    # open
+                    DnsCache.install(ttl=float(Env.get("DNS_CACHE_TTL", 60)))
+
+                    # Expired sessions are reaped when they are next accessed,
+                    # so the background sweep only runs occasionally as a
+                    # safety net for sessions that are never seen again. The
+                    # interval is at least one second, so a zero or negative
+                    # setting cannot turn the sweep into a busy loop
+                    interval = max(1.0, float(
+                        Env.get("CLEANUP_INTERVAL", max(session_timeout, 3600))
+                    ))
+                    threading.Thread(
+                        target=instance._cleanupLoop,
+                        args=(interval,),
+                        name="session-cleanup",
+                        daemon=True,
+                    ).start()
+                    cls._instance = instance
+        return cls._instance
 
     def createSession(
         self,
@@ -65,32 +392,37 @@ class SessionManager:
         str
             Unique session identifier.
         """
-        # Generate a unique session ID
-        session_id = str(uuid.uuid4())
-
         # Create a new requests.Session instance
         session = requests.Session()
         session.verify = False
 
-        # Initialize session data with default values
-        session_data = {
-            "session_id": session_id,
-            "client_ip": client_ip,
-            "user_agent": user_agent,
-            "created_at": datetime.now(),
-            "last_activity": datetime.now(),
-            "request_count": 0,
-            "instance" : session
-        }
+        # Keep cookies and headers per session, but send every request
+        # through the shared transport
+        session.mount("http://", self._adapter)
+        session.mount("https://", self._adapter)
 
-        # Store the session in the sessions dictionary
-        self._sessions[session_id] = session_data
-        return session_id
+        # Initialize session data with default values
+        session_data = SessionRecord(
+            session_id=secrets.token_hex(16),
+            client_ip=client_ip,
+            user_agent=user_agent,
+            created_at=time.time(),
+            last_activity=time.monotonic_ns(),
+            request_count=0,
+            instance=session,
+        )
+
+        # Store the session under a unique ID, drawing a new one in the
+        # unlikely event of a collision. Least recently used sessions evicted
+        # to stay within the cap are simply dropped, their transport is shared
+        while not self._sessions.add(session_data.session_id, session_data):
+            session_data.session_id = secrets.token_hex(16)
+        return session_data.session_id
 
     def getSession(
         self,
         session_id: str
-    ) -> dict[str, Any] | None:
+    ) -> SessionRecord | None:
         """
         Retrieve the data of a specific session.
 
@@ -101,8 +433,8 @@ class SessionManager:
 
         Returns
         -------
-        dict[str, Any] or None
-            Dictionary with session data if found, otherwise None.
+        SessionRecord or None
+            Session data if found, otherwise None.
         """
         # Return session data if it exists, otherwise None
         return self._sessions.get(session_id)
@@ -129,12 +461,12 @@ class SessionManager:
         ValueError
             If the session is not found.
         """
-        # Get the session dictionary for the given session_id
-        session = self.getSession(session_id)
-        if not session or "instance" not in session or not session["instance"]:
+        # Get the session record for the given session_id
+        session = self._sessions.get(session_id)
+        if session is None:
             error_msg = "Session not found."
             raise ValueError(error_msg)
-        return session["instance"]
+        return session.instance
 
     def sessionExists(
         self,
@@ -173,15 +505,14 @@ class SessionManager:
         bool
             True if the session exists and is not expired, otherwise False.
         """
-        # Verify session existence
-        if not self.sessionExists(session_id):
+        # Verify session existence with a single lookup
+        session = self._sessions.get(session_id)
+        if session is None:
             return False
-
-        session = self._sessions[session_id]
-        last_activity = session["last_activity"]
+        last_activity = session.last_activity
 
         # Check if the session has expired
-        if datetime.now() - last_activity > timedelta(seconds=self._session_timeout):
+        if time.monotonic_ns() - last_activity > self._session_timeout_ns:
             self.deleteSession(session_id)
             return False
         return True
@@ -203,10 +534,51 @@ class SessionManager:
         None
             This method does not return a value.
         """
-        # Update last activity and increment request count if session exists
-        if self.sessionExists(session_id):
-            self._sessions[session_id]["last_activity"] = datetime.now()
-            self._sessions[session_id]["request_count"] += 1
+        # Update last activity and increment request count if session exists,
+        # moving it to the most recently used end of the store
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_activity = time.monotonic_ns()
+            session.request_count = next(session.request_counter)
+            self._sessions.touch(session_id)
+
+    def touchAndGet(
+        self,
+        session_id: str
+    ) -> requests.Session | None:
+        """
+        Validate a session, record its activity and return its instance.
+
+        Combines isSessionValid, updateLastActivity and getSessionInstance
+        into a single store lookup for the per-request path.
+
+        Parameters
+        ----------
+        session_id : str
+            Session ID.
+
+        Returns
+        -------
+        requests.Session or None
+            The session instance, or None if the session does not exist or
+            has expired.
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+
+        # Expired sessions are deleted on access
+        now = time.monotonic_ns()
+        if now - session.last_activity > self._session_timeout_ns:
+            self.deleteSession(session_id)
+            return None
+
+        # Record the activity and move the session to the most recently used
+        # end of its stripe
+        session.last_activity = now
+        session.request_count = next(session.request_counter)
+        self._sessions.touch(session_id)
+        return session.instance
 
     def deleteSession(
         self,
@@ -225,46 +597,80 @@ class SessionManager:
         None
             This method does not return a value.
         """
-        # Remove the session if it exists
-        if self.sessionExists(session_id):
-            self._sessions[session_id]["instance"].close()
-            del self._sessions[session_id]
+        # Only the session's cookies and headers are discarded; closing the
+        # instance would tear down the transport shared by every session
+        self._sessions.pop(session_id)
 
     def cleanupExpiredSessions(self) -> None:
         """
         Remove expired sessions from the session store.
 
-        Iterates through all sessions and deletes those whose last activity
-        exceeds the session timeout.
+        Expired sessions are already removed when they are accessed, so this
+        only reclaims sessions that are never used again. It runs from the
+        background safety-net loop and can also be triggered manually.
+
+        Each stripe of the store is kept in order of last activity, so
+        expired sessions are always at its front and the scan stops at the
+        first session that is still alive, touching only the expired entries.
 
         Returns
         -------
         None
             This method does not return a value.
         """
-        expired_sessions = []
-        current_time = datetime.now()
-        for session_id, session_data in self._sessions.items():
-            last_activity = session_data["last_activity"]
-            if current_time - last_activity > timedelta(seconds=self._session_timeout):
-                expired_sessions.append(session_id)
-        for session_id in expired_sessions:
-            self.deleteSession(session_id)
+        # Compute the expiry cutoff once, so each visited session costs a
+        # single integer comparison
+        cutoff = time.monotonic_ns() - self._session_timeout_ns
+        self._sessions.popExpired(
+            lambda session_data: session_data.last_activity < cutoff
+        )
+
+    def _cleanupLoop(self, interval: float) -> None:
+        """
+        Periodically remove expired sessions for the life of the process.
+
+        Parameters
+        ----------
+        interval : float
+            Seconds to wait between cleanups.
 
-    def getSessionStats(self) -> Dict[str, Any]:
+        Returns
+        -------
+        None
+            This method does not return a value.
+        """
+        while True:
+            try:
+                time.sleep(interval)
+                self.cleanupExpiredSessions()
+            except Exception as e:
+                Log.error("Error while cleaning up expired sessions: %s", e)
+
+    def getSessionStats(self, detailed: bool = False) -> Dict[str, Any]:
         """
         Retrieve statistics of active sessions.
 
+        Parameters
+        ----------
+        detailed : bool, optional
+            Whether to include a snapshot of every session record. Taking it
+            walks the whole store, so it is skipped by default.
+
         Returns
         -------
         Dict[str, Any]
-            Dictionary containing the total number of sessions, session timeout,
-            and session details.
+            Dictionary containing the total number of sessions, session
+            timeout, session cap and, if requested, the session records.
         """
         # Calculate the total number of active sessions
         total_sessions = len(self._sessions)
-        return {
+        stats: Dict[str, Any] = {
             "total_sessions": total_sessions,
             "session_timeout": self._session_timeout,
-            "sessions": self._sessions,
-        }
\ No newline at end of file
+            "max_sessions": self._max_sessions,
+        }
+
+        # Copy the records only on request; the live store is never exposed
+        if detailed:
+            stats["sessions"] = self._sessions.values()
+        return stats
\ No newline at end of file
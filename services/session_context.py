@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from starlette.requests import Request
+import requests
+
+@dataclass(slots=True)
+class SessionContext:
+    """
+    Hold the validated session bound to an incoming request.
+
+    Attributes
+    ----------
+    session_id : str
+        Unique identifier of the session.
+    instance : requests.Session
+        The requests.Session instance associated with the session.
+    """
+
+    session_id: str
+    instance: requests.Session
+
+    @classmethod
+    def fromRequest(cls, request: Request) -> "SessionContext":
+        """
+        Retrieve the session context attached by the session middleware.
+
+        Intended to be used as a FastAPI dependency.
+
+        Parameters
+        ----------
+        request : Request
+            The incoming request object.
+
+        Returns
+        -------
+        SessionContext
+            The session context for the current request.
+        """
+        return request.state.session_context
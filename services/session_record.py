@@ -0,0 +1,41 @@
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+import itertools
+import requests
+
+@dataclass(slots=True)
+class SessionRecord:
+    """
+    Hold the state of a session stored by the SessionManager.
+
+    Attributes
+    ----------
+    session_id : str
+        Unique identifier of the session.
+    client_ip : str
+        IP address of the client that created the session.
+    user_agent : str | None
+        User-Agent string of the client that created the session.
+    created_at : float
+        Wall-clock creation time, in seconds since the epoch.
+    last_activity : int
+        Monotonic time of the last request, in nanoseconds.
+    request_count : int
+        Number of requests made with the session.
+    instance : requests.Session
+        The requests.Session instance associated with the session.
+    request_counter : Iterator[int]
+        Source of request_count values. next() on it is atomic, so
+        concurrent requests never lose an increment.
+    """
+
+    session_id: str
+    client_ip: str
+    user_agent: str | None
+    created_at: float
+    last_activity: int
+    request_count: int
+    instance: requests.Session
+    request_counter: Iterator[int] = field(
+        default_factory=lambda: itertools.count(1), repr=False
+    )